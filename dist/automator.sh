@@ -316,66 +316,286 @@ run_python_automator() {
     # EMBEDDED_PYTHON_START
     cat << 'EOF_PYTHON' > "$TARGET/$SCRIPT"
 import os
+import re
 import sys
+import asyncio
 import subprocess
 import shutil
+import stat
 import pwd
 import grp
+import functools
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
 
 # --- Configuration & Context ---
 BASE_PATH = os.getcwd() 
 FORGE_PHP = os.environ.get('FORGE_PHP', 'php')
 FORGE_USER = os.environ.get('FORGE_USER', 'forge')
 WEB_USER = 'www-data' 
+DEBUG = os.environ.get('AUTOMATOR_DEBUG', '') == '1'
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'forge-automator'
+)
+
+# Characters that need /bin/sh to interpret; anything else is exec'd directly
+SHELL_CHARS = set('|&;<>()$`*?[]{}~\'"\\')
+
+# KEY=value per line: double quoted (backslash escapes kept verbatim), single
+# quoted or bare value, optional " # comment"
+ENV_LINE_RE = re.compile(
+    r'^[ \t]*([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=[ \t]*'
+    r'(?:"((?:[^"\\]|\\.)*)"|\'([^\']*)\'|([^\r\n]*?))'
+    r'[ \t]*(?:[ \t]#[^\r\n]*)?\r?$',
+    re.MULTILINE
+)
+
+# The two TinyFileManager assignments we rewrite, matched in a single pass
+TFM_CONFIG_RE = re.compile(rb'(\$auth_users|\$directories_users)\s*=\s*array\([^)]*\);')
+
+LOG_COLORS = {
+    "INFO": "\033[0;34m",    # Blue
+    "SUCCESS": "\033[0;32m", # Green
+    "WARN": "\033[1;33m",    # Yellow
+    "ERROR": "\033[0;31m",   # Red
+}
+# Per-level line templates, built once instead of on every log() call
+LOG_TEMPLATES = {level: f"{color}[{level}] %s\033[0m\n" for level, color in LOG_COLORS.items()}
+
+def format_log(msg, level="INFO"):
+    template = LOG_TEMPLATES.get(level) or f"[{level}] %s\033[0m\n"
+    return template % (msg,)
 
 def log(msg, level="INFO"):
-    colors = {
-        "INFO": "\033[0;34m",    # Blue
-        "SUCCESS": "\033[0;32m", # Green
-        "WARN": "\033[1;33m",    # Yellow
-        "ERROR": "\033[0;31m",   # Red
-        "RESET": "\033[0m"
-    }
-    print(f"{colors.get(level, '')}[{level}] {msg}{colors['RESET']}")
-
-def run_cmd(cmd, check=False, shell=False):
+    sys.stdout.write(format_log(msg, level))
+
+def run_cmd(cmd, check=False, shell=None, capture=True):
     try:
+        # Only pay for a shell when the command string actually needs one
+        if shell is None:
+            shell = isinstance(cmd, str) and any(c in SHELL_CHARS for c in cmd)
+
         if isinstance(cmd, str) and not shell:
             cmd = cmd.split()
         
-        # Use shell=True if complex command string
+        # Fire-and-forget commands skip the pipes entirely
+        stream = subprocess.PIPE if capture else subprocess.DEVNULL
         result = subprocess.run(
             cmd, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
+            stdout=stream, 
+            stderr=stream, 
             text=True, 
             cwd=BASE_PATH,
             shell=shell
         )
         if check and result.returncode != 0:
             raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        if not capture:
+            return True, "", ""
         return True, result.stdout.strip(), result.stderr.strip()
     except Exception as e:
         return False, "", str(e)
 
+def _read_sidecar(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _write_sidecar(path, value):
+    if not value:
+        _remove_quietly(path)
+        return
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path:
+            _remove_quietly(tmp_path)
+
+def _open_part(directory):
+    # Private temp file to download into, or (None, None) if the directory is unusable
+    try:
+        os.makedirs(directory, exist_ok=True)
+        return tempfile.mkstemp(dir=directory, suffix='.part')
+    except OSError:
+        return None, None
+
+def download_file(url, dest):
+    # A copy of every download is kept in CACHE_DIR together with its
+    # ETag / Last-Modified, so unchanged files cost only a conditional GET.
+    # CACHE_DIR is shared by every site on the box, so each run downloads
+    # into its own temp file and only complete files are swapped in
+    cache_path = os.path.join(CACHE_DIR, os.path.basename(dest))
+    fd, part_path = _open_part(CACHE_DIR)
+    use_cache = fd is not None
+    if not use_cache:
+        # No usable cache (missing or read-only HOME): download straight into dest
+        cache_path = dest
+        fd, part_path = _open_part(os.path.dirname(dest))
+        if fd is None:
+            log(f"Download failed for {url}: cannot write to {os.path.dirname(dest)}", "WARN")
+            return False
+
+    headers = {}
+    if use_cache and os.path.exists(cache_path):
+        etag = _read_sidecar(cache_path + '.etag')
+        modified = _read_sidecar(cache_path + '.last-modified')
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+
+    try:
+        with os.fdopen(fd, 'wb') as f, urlopen(Request(url, headers=headers), timeout=30) as response:
+            shutil.copyfileobj(response, f, length=1 << 16)
+            # read(n) just returns short at EOF, so a cut-off body must be caught here
+            expected = response.headers.get('Content-Length')
+            if expected and expected.isdigit() and f.tell() != int(expected):
+                raise OSError(f"truncated download ({f.tell()} of {expected} bytes)")
+            etag = response.headers.get('ETag')
+            modified = response.headers.get('Last-Modified')
+        if not use_cache:
+            # mkstemp creates 0600, the web server has to be able to read the tool
+            os.chmod(part_path, 0o644)
+        os.replace(part_path, cache_path)
+        part_path = None
+        if use_cache:
+            _write_sidecar(cache_path + '.etag', etag)
+            _write_sidecar(cache_path + '.last-modified', modified)
+    except HTTPError as e:
+        _remove_quietly(part_path)
+        # 304 Not Modified: the cached copy is still current
+        if e.code != 304 or not use_cache:
+            log(f"Download failed for {url}: {e}", "WARN")
+            return False
+    except Exception as e:
+        # Network errors, bad URLs, and truncated bodies (http.client.IncompleteRead)
+        log(f"Download failed for {url}: {e!r}", "WARN")
+        if part_path:
+            _remove_quietly(part_path)
+        return False
+
+    if not use_cache:
+        return True
+    try:
+        shutil.copyfile(cache_path, dest)
+    except OSError as e:
+        log(f"Could not copy {cache_path} to {dest}: {e}", "WARN")
+        return False
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _system_users():
+    # One pass over the passwd database instead of a lookup per candidate
+    return frozenset(p.pw_name for p in pwd.getpwall())
+
+@functools.lru_cache(maxsize=None)
+def _uid(name):
+    return pwd.getpwnam(name).pw_uid
+
+@functools.lru_cache(maxsize=None)
+def _gid(name):
+    return grp.getgrnam(name).gr_gid
+
 def detect_web_user():
     candidates = ['www-data', 'nginx', 'apache']
+    users = _system_users()
     for user in candidates:
-        try:
-            pwd.getpwnam(user)
+        if user in users:
             return user
-        except KeyError:
-            continue
     return 'www-data'
 
+def _fix_entry(name, st, uid, gid, mode, dir_fd=None):
+    # Only issue the chown/chmod that would actually change something: each
+    # one dirties the inode even as a no-op, and on a redeploy most of the
+    # tree is already correct
+    if (uid != -1 and st.st_uid != uid) or (gid != -1 and st.st_gid != gid):
+        try:
+            os.chown(name, uid, gid, dir_fd=dir_fd, follow_symlinks=False)
+        except OSError:
+            pass
+    if stat.S_ISLNK(st.st_mode):
+        return
+    if stat.S_ISDIR(st.st_mode):
+        # Like chmod(1), keep setuid/setgid on directories
+        mode |= st.st_mode & (stat.S_ISUID | stat.S_ISGID)
+    if stat.S_IMODE(st.st_mode) != mode:
+        os.chmod(name, mode, dir_fd=dir_fd)
+
+def _fix_dir_fd(dir_fd, uid, gid, dmode, fmode):
+    # Entries are addressed relative to the open directory (fstatat/fchownat/fchmodat),
+    # so the kernel never re-resolves the full path for each file
+    with os.scandir(dir_fd) as entries:
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            is_dir = stat.S_ISDIR(st.st_mode)
+            try:
+                _fix_entry(entry.name, st, uid, gid, dmode if is_dir else fmode, dir_fd)
+            except OSError:
+                # Like chmod -R, a directory we cannot change is still descended into
+                pass
+            if not is_dir:
+                continue
+            try:
+                sub_fd = os.open(entry.name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dir_fd)
+            except OSError:
+                continue
+            try:
+                _fix_dir_fd(sub_fd, uid, gid, dmode, fmode)
+            except OSError:
+                pass
+            finally:
+                os.close(sub_fd)
+
+def _fix_tree(root, uid, gid, dmode, fmode):
+    # One walk replacing `chown -R`, `chmod -R dmode` and `find -type f -exec chmod fmode`
+    # The root itself may be a symlink (shared storage on zero-downtime deploys)
+    root = os.path.realpath(root)
+    try:
+        _fix_entry(root, os.stat(root), uid, gid, dmode)
+    except OSError:
+        pass
+    try:
+        root_fd = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        _fix_dir_fd(root_fd, uid, gid, dmode, fmode)
+    except OSError:
+        pass
+    finally:
+        os.close(root_fd)
+
 def fix_permissions():
     log("Running Permission Fixes...", "INFO")
     
-    # 1. Determine Users
+    # 1. Determine Users (-1 leaves that side of the ownership unchanged)
+    uid, gid = -1, -1
     try:
-        # Just resolve strictly to ensure they exist
-        pwd.getpwnam(FORGE_USER)
-        pwd.getpwnam(WEB_USER)
+        uid = _uid(FORGE_USER)
+        gid = _gid(WEB_USER)
     except KeyError:
         log(f"User {FORGE_USER} or {WEB_USER} not found. Using current user fallback.", "WARN")
         # In Docker simulation this might happen if we aren't careful, but we handle it.
@@ -388,28 +608,63 @@ def fix_permissions():
     
     for relative_path in writable_dirs:
         abs_path = os.path.join(BASE_PATH, relative_path)
-        if not os.path.exists(abs_path):
-            try:
-                os.makedirs(abs_path)
-            except OSError:
-                continue
+        try:
+            os.makedirs(abs_path, exist_ok=True)
+        except OSError:
+            continue
 
-        run_cmd(f"chown -R {FORGE_USER}:{WEB_USER} {abs_path}", shell=True)
-        run_cmd(f"chmod -R 775 {abs_path}", shell=True)
-        run_cmd(f"find {abs_path} -type f -exec chmod 664 {{}} +", shell=True)
+        _fix_tree(abs_path, uid, gid, 0o775, 0o664)
         log(f"Fixed permissions for {relative_path}", "SUCCESS")
 
     # 3. Fix Public (755)
     public_path = os.path.join(BASE_PATH, 'public')
     if os.path.exists(public_path):
-        run_cmd(f"chown -R {FORGE_USER}:{WEB_USER} {public_path}", shell=True)
-        run_cmd(f"chmod -R 755 {public_path}", shell=True)
-        run_cmd(f"find {public_path} -type f -exec chmod 644 {{}} +", shell=True)
+        _fix_tree(public_path, uid, gid, 0o755, 0o644)
         log("Fixed permissions for public", "SUCCESS")
 
     # .env permissions are left to the user/Forge
 
-def setup_environment():
+BANNER_RULE = "----------------------------------------------------------------"
+
+# .env suggestions: (key, predicate on the lower-cased value, banner lines).
+# Lines are formatted with {key} and {value} (the raw value, or 'not set').
+ARRAY_DRIVER_LINES = [
+    ("[SUGGESTION] {key} is set to 'array'.", "WARN"),
+    ("This driver does not persist data between requests.", "INFO"),
+    ("Consider using 'file', 'database', or 'redis' for production.", "WARN"),
+]
+ENV_RULES = [
+    ('APP_DEBUG', lambda v: v == 'true', [
+        ("[ATTENTION] APP_DEBUG is set to 'true'.", "WARN"),
+        ("For production environments, it is highly recommended to set this to 'false'.", "WARN"),
+        ("Suggestion: Update your .env file with:", "WARN"),
+        ("APP_DEBUG=false", "SUCCESS"),
+    ]),
+    ('APP_ENV', lambda v: v != 'production', [
+        ("[SUGGESTION] APP_ENV is not set to 'production'.", "WARN"),
+        ("Current Value: {value}", "INFO"),
+        ("On a live Forge server, it is recommended to use:", "WARN"),
+        ("APP_ENV=production", "SUCCESS"),
+    ]),
+    ('APP_URL', lambda v: 'localhost' in v or not v.startswith('http'), [
+        ("[SUGGESTION] APP_URL might be misconfigured.", "WARN"),
+        ("Current Value: {value}", "INFO"),
+        ("Ensure APP_URL matches your actual domain (including https://).", "WARN"),
+    ]),
+    ('QUEUE_CONNECTION', lambda v: v == 'sync', [
+        ("[SUGGESTION] QUEUE_CONNECTION is set to 'sync'.", "WARN"),
+        ("Jobs will run in the foreground, which can slow down requests.", "INFO"),
+        ("Consider using 'database' or 'redis' for better performance on Forge.", "WARN"),
+    ]),
+    ('SESSION_DRIVER', lambda v: v == 'array', ARRAY_DRIVER_LINES),
+    ('CACHE_DRIVER', lambda v: v == 'array', ARRAY_DRIVER_LINES),
+]
+
+def format_banner(lines):
+    lines = [("", "INFO"), (BANNER_RULE, "WARN"), *lines, (BANNER_RULE, "WARN"), ("", "INFO")]
+    return "".join(format_log(msg, level) for msg, level in lines)
+
+def setup_environment(env_vars):
     log("Checking Environment...", "INFO")
     
     env_path = os.path.join(BASE_PATH, '.env')
@@ -419,178 +674,167 @@ def setup_environment():
         log("Please ensure .env is properly configured.", "ERROR")
         sys.exit(1)
 
-    
-    
     # Analyze .env content for suggestions (Read-Only)
-    env_vars = parse_env_file(env_path)
-    
+    # All banners are collected and written out in one go
+    banners = []
+
     # 1. APP_KEY Check
     if not env_vars.get('APP_KEY'):
-         success, new_key, _ = run_cmd(f"{FORGE_PHP} artisan key:generate --show", shell=True)
-         if success:
-             log("", "INFO")
-             log("----------------------------------------------------------------", "WARN")
-             log("[ATTENTION] APP_KEY is missing in your .env file!", "WARN")
-             log("Please copy the following line and add it to your .env file:", "WARN")
-             log(f"APP_KEY={new_key}", "SUCCESS")
-             log("----------------------------------------------------------------", "WARN")
-             log("", "INFO")
-
-    # 2. APP_DEBUG Check
-    if env_vars.get('APP_DEBUG', '').lower() == 'true':
-         log("", "INFO")
-         log("----------------------------------------------------------------", "WARN")
-         log("[ATTENTION] APP_DEBUG is set to 'true'.", "WARN")
-         log("For production environments, it is highly recommended to set this to 'false'.", "WARN")
-         log("Suggestion: Update your .env file with:", "WARN")
-         log("APP_DEBUG=false", "SUCCESS")
-         log("----------------------------------------------------------------", "WARN")
-         log("", "INFO")
-
-    # 3. APP_ENV Check
-    if env_vars.get('APP_ENV', '').lower() != 'production':
-         log("", "INFO")
-         log("----------------------------------------------------------------", "WARN")
-         log("[SUGGESTION] APP_ENV is not set to 'production'.", "WARN")
-         log(f"Current Value: {env_vars.get('APP_ENV', 'not set')}", "INFO")
-         log("On a live Forge server, it is recommended to use:", "WARN")
-         log("APP_ENV=production", "SUCCESS")
-         log("----------------------------------------------------------------", "WARN")
-         log("", "INFO")
-
-    # 4. APP_URL Check
-    app_url = env_vars.get('APP_URL', '')
-    if 'localhost' in app_url or not app_url.startswith('http'):
-         log("", "INFO")
-         log("----------------------------------------------------------------", "WARN")
-         log("[SUGGESTION] APP_URL might be misconfigured.", "WARN")
-         log(f"Current Value: {app_url}", "INFO")
-         log("Ensure APP_URL matches your actual domain (including https://).", "WARN")
-         log("----------------------------------------------------------------", "WARN")
-         log("", "INFO")
-
-    # 5. QUEUE_CONNECTION Check
-    if env_vars.get('QUEUE_CONNECTION', '') == 'sync':
-         log("", "INFO")
-         log("----------------------------------------------------------------", "WARN")
-         log("[SUGGESTION] QUEUE_CONNECTION is set to 'sync'.", "WARN")
-         log("Jobs will run in the foreground, which can slow down requests.", "INFO")
-         log("Consider using 'database' or 'redis' for better performance on Forge.", "WARN")
-         log("----------------------------------------------------------------", "WARN")
-         log("", "INFO")
-
-    # 6. SESSION_DRIVER & CACHE_DRIVER Check
-    for driver in ['SESSION_DRIVER', 'CACHE_DRIVER']:
-        if env_vars.get(driver, '') == 'array':
-             log("", "INFO")
-             log("----------------------------------------------------------------", "WARN")
-             log(f"[SUGGESTION] {driver} is set to 'array'.", "WARN")
-             log("This driver does not persist data between requests.", "INFO")
-             log("Consider using 'file', 'database', or 'redis' for production.", "WARN")
-             log("----------------------------------------------------------------", "WARN")
-             log("", "INFO")
+        success, new_key, _ = run_cmd([FORGE_PHP, "artisan", "key:generate", "--show"])
+        if success:
+            banners.append(format_banner([
+                ("[ATTENTION] APP_KEY is missing in your .env file!", "WARN"),
+                ("Please copy the following line and add it to your .env file:", "WARN"),
+                (f"APP_KEY={new_key}", "SUCCESS"),
+            ]))
+
+    # 2. Remaining checks (ENV_RULES), each value lower-cased exactly once
+    env_lc = {key: env_vars.get(key, '').lower() for key, _, _ in ENV_RULES}
+    for key, predicate, lines in ENV_RULES:
+        if predicate(env_lc[key]):
+            value = env_vars.get(key, 'not set')
+            banners.append(format_banner(
+                [(msg.format(key=key, value=value), level) for msg, level in lines]
+            ))
+
+    if banners:
+        sys.stdout.write("".join(banners))
+        sys.stdout.flush()
+
+async def _run_artisan(*args):
+    # Output is only worth capturing when debugging, otherwise discard it
+    stream = asyncio.subprocess.PIPE if DEBUG else asyncio.subprocess.DEVNULL
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            FORGE_PHP, "artisan", *args,
+            stdout=stream,
+            stderr=stream,
+            cwd=BASE_PATH
+        )
+    except OSError as e:
+        return False, "", str(e)
+    stdout, stderr = await proc.communicate()
+    stdout = stdout.decode().strip() if stdout else ""
+    stderr = stderr.decode().strip() if stderr else ""
+    if DEBUG and proc.returncode != 0:
+        log(f"artisan {' '.join(args)} failed: {stderr or stdout}", "WARN")
+    return proc.returncode == 0, stdout, stderr
+
+async def _optimize():
+    await _run_artisan("optimize:clear")
+
+    # config:cache goes first, the remaining warmers boot against the cached config
+    await _run_artisan("config:cache")
+    warmers = ["event:cache", "route:cache", "view:cache"]
+    if (os.cpu_count() or 1) >= 2:
+        await asyncio.gather(*(_run_artisan(name) for name in warmers))
+    else:
+        for name in warmers:
+            await _run_artisan(name)
+
+    # Queue Restart (Important on Forge)
+    await _run_artisan("queue:restart")
 
 def optimize_application():
     log("Optimizing Application...", "INFO")
-    cmds = [
-        f"{FORGE_PHP} artisan optimize:clear",
-        f"{FORGE_PHP} artisan config:cache",
-        f"{FORGE_PHP} artisan event:cache",
-        f"{FORGE_PHP} artisan route:cache",
-        f"{FORGE_PHP} artisan view:cache",
-    ]
-    for cmd in cmds:
-        run_cmd(cmd, shell=True)
-
-    # Queue Restart (Important on Forge)
-    run_cmd(f"{FORGE_PHP} artisan queue:restart", shell=True)
+    asyncio.run(_optimize())
 
 def main():
     global WEB_USER
     WEB_USER = detect_web_user()
     log(f"Automator initialized (User: {FORGE_USER}, Web: {WEB_USER})", "INFO")
 
-    setup_environment()
+    # Parse .env once and share it with every step that needs it
+    env_vars = parse_env_file(os.path.join(BASE_PATH, '.env'))
+
+    setup_environment(env_vars)
     fix_permissions()
     
     # Storage Link check
     pub_st = os.path.join(BASE_PATH, 'public/storage')
-    if not os.path.exists(pub_st) and not os.path.islink(pub_st):
-        run_cmd(f"{FORGE_PHP} artisan storage:link", shell=True)
+    try:
+        # lstat also sees a dangling link, so one call covers exists() and islink()
+        os.lstat(pub_st)
+        has_link = True
+    except OSError:
+        has_link = False
+    if not has_link:
+        run_cmd([FORGE_PHP, "artisan", "storage:link"], capture=False)
 
     optimize_application()
     
     # Install Support Tools (Adminer + File Manager)
-    install_management_tools()
+    install_management_tools(env_vars)
     
     log("Automator finished successfully.", "SUCCESS")
 
+def _env_value(match):
+    if match[1] or match[2]:
+        return match[1] or match[2]
+    # Bare fallback still peels matching outer quotes, as the line parser did
+    value = match[3]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
 def parse_env_file(path):
     """
     Robust .env parsing ensuring we handle spaces, quotes, and comments correctly.
     Returns a dict.
     """
-    env_vars = {}
-    if not os.path.exists(path):
-        return env_vars
-        
-    with open(path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            
-            if '=' in line:
-                key, val = line.split('=', 1)
-                key = key.strip()
-                val = val.strip()
-                
-                # Remove quotes if present
-                if (val.startswith('"') and val.endswith('"')) or \
-                   (val.startswith("'") and val.endswith("'")):
-                    val = val[1:-1]
-                    
-                env_vars[key] = val
-    return env_vars
-
-def install_management_tools():
+    try:
+        with open(path, 'r') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return {}
+    return {m[0]: _env_value(m) for m in ENV_LINE_RE.findall(data)}
+
+def install_management_tools(env_vars):
     log("Installing Project Management Tools...", "INFO")
     
     import secrets
     import string
     
-    # 0. Load Env Data first
-    env_path = os.path.join(BASE_PATH, '.env')
-    env_vars = parse_env_file(env_path)
-    
     # 1. Setup Directory
     rand_suffix = ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(6))
     tools_dir_name = f"forge-tools-{rand_suffix}"
     tools_path = os.path.join(BASE_PATH, 'public', tools_dir_name)
     
     # Cleanup old tools directories
+    # shutil.rmtree already deletes with fd-relative unlinkat on Linux; on
+    # Python 3.11+ it can also start from the open public/ descriptor
     try:
         public_path = os.path.join(BASE_PATH, 'public')
-        if os.path.exists(public_path):
-            with os.scandir(public_path) as entries:
+        public_fd = os.open(public_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            with os.scandir(public_fd) as entries:
                 for entry in entries:
-                    if entry.is_dir() and entry.name.startswith("forge-tools-"):
+                    # Cheap name check first; is_dir(follow_symlinks=False) then uses d_type
+                    if entry.name.startswith("forge-tools-") and entry.is_dir(follow_symlinks=False):
                         try:
-                            shutil.rmtree(entry.path)
+                            if sys.version_info >= (3, 11):
+                                shutil.rmtree(entry.name, dir_fd=public_fd)
+                            else:
+                                shutil.rmtree(os.path.join(public_path, entry.name))
                         except OSError:
                             pass
+        finally:
+            os.close(public_fd)
     except Exception:
         pass 
         
     os.makedirs(tools_path, exist_ok=True)
     
-    # 2. Download Adminer
+    # 2. Download Adminer & 3. TinyFileManager (different hosts, fetched in parallel)
     adminer_url = "https://www.adminer.org/latest.php"
-    run_cmd(f"curl -L -s -o {tools_path}/adminer.php {adminer_url}", shell=True)
-    
-    # 3. Download TinyFileManager
     tfm_url = "https://raw.githubusercontent.com/prasathmani/tinyfilemanager/master/tinyfilemanager.php"
-    run_cmd(f"curl -L -s -o {tools_path}/filemanager.php {tfm_url}", shell=True)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        downloads = [
+            pool.submit(download_file, adminer_url, f"{tools_path}/adminer.php"),
+            pool.submit(download_file, tfm_url, f"{tools_path}/filemanager.php"),
+        ]
+    if not all(future.result() for future in downloads):
+        log("Not every tool could be downloaded, see the warnings above.", "WARN")
     
     # 4. Configure TinyFileManager
     # User requested to use DB credentials for File Manager
@@ -607,23 +851,34 @@ def install_management_tools():
         log("Warning: DB_USERNAME or DB_PASSWORD not found in .env. Using generated credentials for File Manager.", "WARN")
     
     # Generate Hash
-    # Escape quotes for the PHP command
-    safe_pass = tfm_pass.replace("'", "'\\''") 
-    php_hash_cmd = f"{FORGE_PHP} -r \"echo password_hash('{safe_pass}', PASSWORD_DEFAULT);\""
-    success, tfm_hash, _ = run_cmd(php_hash_cmd, shell=True)
+    success, tfm_hash = False, ""
+    if bcrypt is not None:
+        try:
+            # Same algorithm as PHP's password_hash, which tags it $2y$ instead of $2b$
+            tfm_hash = bcrypt.hashpw(tfm_pass.encode(), bcrypt.gensalt(rounds=10)).decode()
+            tfm_hash = "$2y$" + tfm_hash[4:]
+            success = True
+        except ValueError:
+            # Passwords over 72 bytes or containing NUL are rejected; fall back to PHP
+            pass
+    if not success:
+        # Password is handed over as an argument, so no quoting is needed
+        php_hash_cmd = [FORGE_PHP, "-r", "echo password_hash($argv[1], PASSWORD_DEFAULT);", "--", tfm_pass]
+        success, tfm_hash, _ = run_cmd(php_hash_cmd, check=True)
     
     if not success or not tfm_hash:
         tfm_hash = "$2y$10$MixedHashPlaceholder..."
         
     # Inject Config
     tfm_file = os.path.join(tools_path, 'filemanager.php')
-    if os.path.exists(tfm_file):
-        with open(tfm_file, 'r') as f:
+    try:
+        with open(tfm_file, 'rb') as f:
             content = f.read()
-            
+    except FileNotFoundError:
+        content = None
+
+    if content is not None:
         new_auth = f"$auth_users = array(\n    '{tfm_user}' => '{tfm_hash}'\n);"
-        import re
-        content = re.sub(r'\$auth_users\s*=\s*array\([^)]*\);', new_auth, content, flags=re.DOTALL)
         
         # Configure Root Path to Project Root
         # If we are in a release folder (.../releases/TIMESTAMP), the real root is 2 levels up
@@ -636,10 +891,21 @@ def install_management_tools():
         
         # Update $directories_users to point to project_root
         new_dirs = f"$directories_users = array(\n    '{tfm_user}' => '{project_root}'\n);"
-        content = re.sub(r'\$directories_users\s*=\s*array\([^)]*\);', new_dirs, content, flags=re.DOTALL)
         
-        with open(tfm_file, 'w') as f:
-            f.write(content)
+        replacements = {
+            b'$auth_users': new_auth.encode(),
+            b'$directories_users': new_dirs.encode(),
+        }
+        
+        # Single buffer written straight to the descriptor, synced once
+        fd = os.open(tfm_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(TFM_CONFIG_RE.sub(lambda m: replacements[m.group(1)], content))
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
     # 5. Get DB Credentials (using robust parser)
     db_host = env_vars.get("DB_HOST", "127.0.0.1")